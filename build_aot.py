@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time compile the simulator's batch kernels into a `sim_kernel` extension module.
+
+Usage:
+  python3 build_aot.py
+
+The module is written next to sim.py. sim.py imports it when it was built from the current
+sim.py source and otherwise falls back to the JIT kernels (cached on disk via cache=True;
+set NUMBA_CACHE_DIR to relocate that cache, e.g. on read-only or shared filesystems).
+"""
+import os
+
+from numba.pycc import CC
+
+import sim
+
+# Line arrays (tags, states, owners, sharers, last_writer, last_word, fs_conf, fs_suspect, lru_ts),
+# clock, stats, events, then the decoded trace slices and the scalar parameters.
+_LINES = "i8[:, ::1], i1[:, ::1], i2[:, ::1], u8[:, ::1], i2[:, ::1], i2[:, ::1], i1[:, ::1], b1[:, ::1], i8[:, ::1]"
+_TRACE = "i4[::1], b1[::1], i8[::1], i8[::1], i8[::1]"
+BATCH_SIG = f"i8({_LINES}, i8[::1], i8[::1], i8[:, ::1], {_TRACE}, i8, i8, i8)"
+
+SOURCE_HASH = sim._source_hash()
+
+
+def source_hash():
+    return SOURCE_HASH
+
+
+def main():
+    cc = CC("sim_kernel")
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.export("access_batch_fix", BATCH_SIG)(sim._access_batch_fix.py_func)
+    cc.export("access_batch_nofix", BATCH_SIG)(sim._access_batch_nofix.py_func)
+    cc.export("source_hash", "i8()")(source_hash)
+    cc.compile()
+    print(f"Wrote {cc.output_file}")
+
+
+if __name__ == "__main__":
+    main()
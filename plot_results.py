@@ -9,11 +9,24 @@ Each JSON file should be produced by sim.py (use --json flag).
 """
 import argparse
 import json
+
+import matplotlib
+
+matplotlib.use("Agg")  # headless: only writes image files, so skip interactive backend setup
 import matplotlib.pyplot as plt
+import numpy as np
 
 
 def load_stats(paths):
-    return [json.load(open(p)) for p in paths]
+    out = []
+    for p in paths:
+        with open(p) as f:
+            out.append(json.load(f))
+    return out
+
+
+def stat_array(stats, key):
+    return np.fromiter((s.get(key, 0) for s in stats), float, len(stats))
 
 
 def main():
@@ -33,28 +46,28 @@ def main():
     fix = load_stats(args.fix)
     labels = args.labels if args.labels else [f"w{i}" for i in range(len(base))]
 
-    ipki_base = [b.get("ipki", 0) for b in base]
-    ipki_fix = [f.get("ipki", 0) for f in fix]
-    ipc_base = [b.get("ipc_proxy", 0) for b in base]
-    ipc_fix = [f.get("ipc_proxy", 0) for f in fix]
+    ipki_base = stat_array(base, "ipki")
+    ipki_fix = stat_array(fix, "ipki")
+    ipc_base = stat_array(base, "ipc_proxy")
+    ipc_fix = stat_array(fix, "ipc_proxy")
 
-    x = range(len(labels))
+    x = np.arange(len(labels))
     width = 0.35
 
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
 
-    ax1.bar([i - width / 2 for i in x], ipki_base, width, label="baseline")
-    ax1.bar([i + width / 2 for i in x], ipki_fix, width, label="fix-up")
+    ax1.bar(x - width / 2, ipki_base, width, label="baseline")
+    ax1.bar(x + width / 2, ipki_fix, width, label="fix-up")
     ax1.set_ylabel("IPKI")
-    ax1.set_xticks(list(x))
+    ax1.set_xticks(x)
     ax1.set_xticklabels(labels)
     ax1.set_title("Invalidations per K Instructions")
     ax1.legend()
 
-    ax2.bar([i - width / 2 for i in x], ipc_base, width, label="baseline")
-    ax2.bar([i + width / 2 for i in x], ipc_fix, width, label="fix-up")
+    ax2.bar(x - width / 2, ipc_base, width, label="baseline")
+    ax2.bar(x + width / 2, ipc_fix, width, label="fix-up")
     ax2.set_ylabel("IPC proxy")
-    ax2.set_xticks(list(x))
+    ax2.set_xticks(x)
     ax2.set_xticklabels(labels)
     ax2.set_title("IPC proxy")
     ax2.legend()
@@ -1,26 +1,44 @@
 #!/usr/bin/env python3
 import argparse
+import contextlib
 import csv
+import hashlib
 import json
-from collections import defaultdict, Counter
+import multiprocessing as mp
+import os
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
+from numba import njit, types
+from numba.extending import intrinsic
 
-# Simple MESI states for a single shared cache model
-INVALID, SHARED, EXCLUSIVE, MODIFIED = "I", "S", "E", "M"
 
+# Simple MESI states for a single shared cache model, encoded for the array-backed line store
+INVALID, SHARED, EXCLUSIVE, MODIFIED = 0, 1, 2, 3
 
-@dataclass
-class CacheLine:
-    tag: int = -1
-    state: str = INVALID
-    owner: Optional[int] = None  # core id for E/M
-    sharers: set = field(default_factory=set)
-    last_writer_core: int = -1
-    last_word: int = 0
-    fs_conf: int = 0
-    fs_suspect: bool = False
+# Fixed stat slots (replaces the string-keyed defaultdict on the hot path)
+S_HITS, S_MISSES, S_INV, S_STALL, S_AVOIDED, S_SUSPECT_LINES, S_SUSPECT_EVENTS, S_INSTR, S_INV_EVENTS = range(9)
+# JSON key for each slot, in slot order
+STAT_NAMES = (
+    "hits",
+    "misses",
+    "invalidations",
+    "stall_cycles",
+    "avoided_invalidations",
+    "suspect_lines",
+    "suspect_events",
+    "instructions",
+    "invalidation_events",
+)
+N_STATS = len(STAT_NAMES)
+
+# Sharers are tracked as a uint64 bitset, one bit per core
+MAX_CORES = 64
 
 
 @dataclass
@@ -35,133 +53,289 @@ class Config:
     hit_latency: int = 4
     miss_latency: int = 40
     inv_latency: int = 10
+    # Shift/mask address decode, derived from the sizes above
+    line_shift: int = field(init=False, repr=False)
+    set_mask: int = field(init=False, repr=False)
+    word_shift: int = field(init=False, repr=False)
+    words_mask: int = field(init=False, repr=False)
 
+    def __post_init__(self):
+        for name in ("line_bytes", "sets", "word_bytes"):
+            value = getattr(self, name)
+            if value <= 0 or value & (value - 1):
+                raise ValueError(f"{name} must be a power of two, got {value}")
+        if self.word_bytes > self.line_bytes:
+            raise ValueError(f"word_bytes ({self.word_bytes}) must not exceed line_bytes ({self.line_bytes})")
+        self.line_shift = self.line_bytes.bit_length() - 1
+        self.set_mask = self.sets - 1
+        self.word_shift = self.word_bytes.bit_length() - 1
+        self.words_mask = self.line_bytes // self.word_bytes - 1
 
-class Cache:
-    def __init__(self, cfg: Config):
-        self.cfg = cfg
-        self.lines: List[List[CacheLine]] = [
-            [CacheLine() for _ in range(cfg.assoc)] for _ in range(cfg.sets)
-        ]
-        self.repl_idx = [0 for _ in range(cfg.sets)]
-
-    def _index_tag(self, addr: int) -> Tuple[int, int]:
-        line_addr = addr // self.cfg.line_bytes
-        return line_addr % self.cfg.sets, line_addr
-
-    def _word_idx(self, addr: int) -> int:
-        return (addr // self.cfg.word_bytes) % (self.cfg.line_bytes // self.cfg.word_bytes)
-
-    def probe(self, addr: int) -> Tuple[CacheLine, bool]:
-        idx, tag = self._index_tag(addr)
-        for line in self.lines[idx]:
-            if line.tag == tag and line.state != INVALID:
-                return line, True
-        repl = self.lines[idx][self.repl_idx[idx]]
-        self.repl_idx[idx] = (self.repl_idx[idx] + 1) % self.cfg.assoc
-        repl.tag, repl.state, repl.owner, repl.sharers = tag, INVALID, None, set()
-        return repl, False
-
-    def access(self, core: int, is_write: bool, addr: int, stats, logger):
-        cfg = self.cfg
-        word_idx = self._word_idx(addr)
-        line, hit = self.probe(addr)
-
-        # Coherence + detector logic
-        if hit:
-            if is_write:
-                # If another core has it, invalidate them unless fix-up suppresses
-                if line.state in (SHARED, EXCLUSIVE, MODIFIED) and line.owner != core:
-                    self._maybe_detect(line, core, word_idx, stats, logger)
-                    if not self._should_suppress(line, word_idx, is_write):
-                        stats["invalidations"] += len(line.sharers - {core})
-                        stats["stall_cycles"] += cfg.inv_latency
-                        line.sharers = {core}
-                    else:
-                        stats["avoided_invalidations"] += len(line.sharers - {core})
-                    line.owner = core
-                    line.state = MODIFIED
-                else:
-                    line.owner = core
-                    line.state = MODIFIED
-            else:
-                # read hit
-                if line.state == MODIFIED and line.owner != core:
-                    self._maybe_detect(line, core, word_idx, stats, logger)
-                    if not self._should_suppress(line, word_idx, is_write):
-                        stats["invalidations"] += 1
-                        stats["stall_cycles"] += cfg.inv_latency
-                        line.sharers = {core, line.owner}
-                        line.state = SHARED
-                    else:
-                        stats["avoided_invalidations"] += 1
-                        line.sharers.add(core)
-                        line.state = SHARED
+
+def decode_addresses(addrs: np.ndarray, cfg: Config) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split uint64 byte addresses into (set index, line tag, word index) arrays in one vectorized pass.
+
+    Tags are returned as an int64 view of the unsigned line address, so the kernel compares the same bits.
+    """
+    addrs = np.asarray(addrs, np.uint64)
+    line_addr = addrs >> np.uint64(cfg.line_shift)
+    set_idx = (line_addr & np.uint64(cfg.set_mask)).astype(np.int64)
+    word_idx = ((addrs >> np.uint64(cfg.word_shift)) & np.uint64(cfg.words_mask)).astype(np.int64)
+    return set_idx, line_addr.view(np.int64), word_idx
+
+
+@intrinsic
+def _popcount(typingctx, mask):
+    """Population count of a uint64 sharer mask, lowered to LLVM ctpop (a single POPCNT on x86)."""
+    if mask != types.uint64:
+        return None
+
+    def codegen(context, builder, signature, args):
+        return builder.ctpop(args[0])
+
+    return types.int64(types.uint64), codegen
+
+
+@njit(cache=True)
+def _probe(tags, states, owners, sharers, lru_ts, clock, idx, tag, assoc):
+    # Compare the whole contiguous tag/state row without an early exit so the loop
+    # vectorizes; at most one valid way can hold a given tag.
+    row_tags = tags[idx]
+    row_states = states[idx]
+    hit_way = -1
+    for way in range(assoc):
+        if row_tags[way] == tag and row_states[way] != INVALID:
+            hit_way = way
+    clock[0] += 1
+    if hit_way >= 0:
+        lru_ts[idx, hit_way] = clock[0]
+        return hit_way, True
+    # Evict the least recently used way (never-touched ways have timestamp 0)
+    way = lru_ts[idx].argmin()
+    lru_ts[idx, way] = clock[0]
+    tags[idx, way] = tag
+    states[idx, way] = INVALID
+    owners[idx, way] = -1
+    sharers[idx, way] = 0
+    return way, False
+
+
+@njit(cache=True)
+def _record_suspect(tags, last_writer, last_word, fs_conf, fs_suspect, idx, way, core, word_idx, fs_threshold, stats, event):
+    """Slow path of the detector, entered only when another core last wrote a different word of the line.
+
+    Bumps confidence, marks the line suspect at the threshold and fills `event` for the logger.
+    """
+    fs_conf[idx, way] = min(fs_conf[idx, way] + 1, 3)
+    if fs_conf[idx, way] >= fs_threshold and not fs_suspect[idx, way]:
+        fs_suspect[idx, way] = True
+        stats[S_SUSPECT_LINES] += 1
+    # event[0] is the event id, assigned by the Logger
+    event[1] = tags[idx, way]
+    event[2] = core
+    event[3] = word_idx
+    event[4] = last_writer[idx, way]
+    event[5] = last_word[idx, way]
+    event[6] = fs_conf[idx, way]
+    event[7] = fs_suspect[idx, way]
+    stats[S_SUSPECT_EVENTS] += 1
+    return True
+
+
+@njit(cache=True)
+def _suppress(fs_suspect, last_word, word_idx, is_write, fix, conservative):
+    """1 if fix-up suppresses this invalidation, else 0; evaluated as a bitwise AND, not a branch chain."""
+    return int(fs_suspect) & fix & int(last_word != word_idx) & (1 - (conservative & int(is_write)))
+
+
+@njit(cache=True, inline="always")
+def _access(
+    tags, states, owners, sharers, last_writer, last_word, fs_conf, fs_suspect, lru_ts, clock, stats, event,
+    core, is_write, idx, tag, word_idx, assoc, fs_threshold, fix, conservative,
+):
+    """Simulate one pre-decoded access against the line arrays; returns True if a suspect event was recorded in `event`."""
+    way, hit = _probe(tags, states, owners, sharers, lru_ts, clock, idx, tag, assoc)
+    bit = np.uint64(1) << np.uint64(core)
+    logged = False
+
+    # Coherence + detector logic
+    if hit:
+        if is_write:
+            # If another core has it, invalidate them unless fix-up suppresses
+            if states[idx, way] != INVALID and owners[idx, way] != core:
+                # Detector fast path: only a different core's write to a different word counts
+                if last_writer[idx, way] != core and last_writer[idx, way] != -1 and last_word[idx, way] != word_idx:
+                    logged = _record_suspect(tags, last_writer, last_word, fs_conf, fs_suspect, idx, way, core, word_idx, fs_threshold, stats, event)
                 else:
-                    line.sharers.add(core)
-                    if line.state == EXCLUSIVE:
-                        line.state = SHARED
-            stats["hits"] += 1
+                    fs_conf[idx, way] = max(fs_conf[idx, way] - 1, 0)
+                suppress = _suppress(fs_suspect[idx, way], last_word[idx, way], word_idx, is_write, fix, conservative)
+                keep = np.uint64(0) - np.uint64(suppress)  # all ones when suppressed
+                # len(sharers - {core}) as one AND plus one POPCNT on the sharer bitmask
+                others = _popcount(sharers[idx, way] & ~bit)
+                stats[S_INV] += others * (1 - suppress)
+                stats[S_AVOIDED] += others * suppress
+                stats[S_INV_EVENTS] += 1 - suppress
+                sharers[idx, way] = (sharers[idx, way] & keep) | (bit & ~keep)
+            owners[idx, way] = core
+            states[idx, way] = MODIFIED
         else:
-            # Miss: bring line in, apply detector on coherence event if others own
-            self._maybe_detect(line, core, word_idx, stats, logger)
-            if is_write:
-                if line.state != INVALID and line.owner is not None and line.owner != core:
-                    if not self._should_suppress(line, word_idx, is_write):
-                        stats["invalidations"] += 1
-                        stats["stall_cycles"] += cfg.inv_latency
-                    else:
-                        stats["avoided_invalidations"] += 1
-                line.owner = core
-                line.state = MODIFIED
-                line.sharers = {core}
+            # read hit
+            if states[idx, way] == MODIFIED and owners[idx, way] != core:
+                # Detector fast path: only a different core's write to a different word counts
+                if last_writer[idx, way] != core and last_writer[idx, way] != -1 and last_word[idx, way] != word_idx:
+                    logged = _record_suspect(tags, last_writer, last_word, fs_conf, fs_suspect, idx, way, core, word_idx, fs_threshold, stats, event)
+                else:
+                    fs_conf[idx, way] = max(fs_conf[idx, way] - 1, 0)
+                suppress = _suppress(fs_suspect[idx, way], last_word[idx, way], word_idx, is_write, fix, conservative)
+                keep = np.uint64(0) - np.uint64(suppress)
+                owner_bit = np.uint64(1) << np.uint64(owners[idx, way])
+                stats[S_INV] += 1 - suppress
+                stats[S_AVOIDED] += suppress
+                stats[S_INV_EVENTS] += 1 - suppress
+                # Suppressed: just add the reader; otherwise the line is now shared by reader + owner
+                sharers[idx, way] = bit | (sharers[idx, way] & keep) | (owner_bit & ~keep)
+                states[idx, way] = SHARED
             else:
-                if line.state != INVALID and line.owner is not None and line.owner != core:
-                    if not self._should_suppress(line, word_idx, is_write):
-                        stats["invalidations"] += 1
-                        stats["stall_cycles"] += cfg.inv_latency
-                    else:
-                        stats["avoided_invalidations"] += 1
-                line.owner = core
-                line.state = EXCLUSIVE
-                line.sharers = {core}
-            line.tag = self._index_tag(addr)[1]
-            stats["misses"] += 1
-            stats["stall_cycles"] += cfg.miss_latency
-
-        # Update detector metadata on write or ownership change
-        if is_write or line.owner == core:
-            line.last_writer_core = core
-            line.last_word = word_idx
-
-    def _maybe_detect(self, line: CacheLine, core: int, word_idx: int, stats, logger):
-        cfg = self.cfg
-        if line.state == INVALID:
-            return
-        if line.last_writer_core != -1 and line.last_writer_core != core and line.last_word != word_idx:
-            line.fs_conf = min(line.fs_conf + 1, 3)
-            if line.fs_conf >= cfg.fs_threshold and not line.fs_suspect:
-                line.fs_suspect = True
-                stats["suspect_lines"] += 1
-            logger.log_suspect(core, line, word_idx)
-            stats["suspect_events"] += 1
+                sharers[idx, way] |= bit
+                if states[idx, way] == EXCLUSIVE:
+                    states[idx, way] = SHARED
+        stats[S_HITS] += 1
+    else:
+        # Miss: bring line in, apply detector on coherence event if others own.
+        # (The probe has just invalidated the victim way, so the state check skips it today.)
+        if states[idx, way] != INVALID:
+            if last_writer[idx, way] != core and last_writer[idx, way] != -1 and last_word[idx, way] != word_idx:
+                logged = _record_suspect(tags, last_writer, last_word, fs_conf, fs_suspect, idx, way, core, word_idx, fs_threshold, stats, event)
+            else:
+                fs_conf[idx, way] = max(fs_conf[idx, way] - 1, 0)
+        if states[idx, way] != INVALID and owners[idx, way] != -1 and owners[idx, way] != core:
+            suppress = _suppress(fs_suspect[idx, way], last_word[idx, way], word_idx, is_write, fix, conservative)
+            stats[S_INV] += 1 - suppress
+            stats[S_AVOIDED] += suppress
+            stats[S_INV_EVENTS] += 1 - suppress
+        owners[idx, way] = core
+        states[idx, way] = MODIFIED if is_write else EXCLUSIVE
+        sharers[idx, way] = bit
+        tags[idx, way] = tag
+        stats[S_MISSES] += 1
+
+    # Update detector metadata on write or ownership change
+    if is_write or owners[idx, way] == core:
+        last_writer[idx, way] = core
+        last_word[idx, way] = word_idx
+    return logged
+
+
+@njit(cache=True, inline="always")
+def _access_batch(
+    tags, states, owners, sharers, last_writer, last_word, fs_conf, fs_suspect, lru_ts, clock, stats, events,
+    cores, is_writes, set_idx, line_tags, word_idx, assoc, fs_threshold, fix, conservative,
+):
+    """Run `_access` over a batch of decoded records; suspect events are packed into `events`, count returned."""
+    n_events = 0
+    for i in range(cores.size):
+        if _access(
+            tags, states, owners, sharers, last_writer, last_word, fs_conf, fs_suspect, lru_ts, clock, stats, events[n_events],
+            cores[i], is_writes[i], set_idx[i], line_tags[i], word_idx[i], assoc, fs_threshold, fix, conservative,
+        ):
+            n_events += 1
+    return n_events
+
+
+# Two compiled entry points specialized on the loop-invariant fix-up switch. `_access` and
+# `_access_batch` are inlined at the IR level, so with fix == 0 the suppress mask constant-folds
+# to zero and the avoided-invalidation updates drop out of the no-fix kernel.
+@njit(cache=True)
+def _access_batch_fix(
+    tags, states, owners, sharers, last_writer, last_word, fs_conf, fs_suspect, lru_ts, clock, stats, events,
+    cores, is_writes, set_idx, line_tags, word_idx, assoc, fs_threshold, conservative,
+):
+    return _access_batch(
+        tags, states, owners, sharers, last_writer, last_word, fs_conf, fs_suspect, lru_ts, clock, stats, events,
+        cores, is_writes, set_idx, line_tags, word_idx, assoc, fs_threshold, 1, conservative,
+    )
+
+
+@njit(cache=True)
+def _access_batch_nofix(
+    tags, states, owners, sharers, last_writer, last_word, fs_conf, fs_suspect, lru_ts, clock, stats, events,
+    cores, is_writes, set_idx, line_tags, word_idx, assoc, fs_threshold, conservative,
+):
+    return _access_batch(
+        tags, states, owners, sharers, last_writer, last_word, fs_conf, fs_suspect, lru_ts, clock, stats, events,
+        cores, is_writes, set_idx, line_tags, word_idx, assoc, fs_threshold, 0, 0,
+    )
+
+
+def _source_hash() -> int:
+    """Fingerprint of this file; an AOT kernel build is only used if it was compiled from the same source."""
+    return int.from_bytes(hashlib.sha1(Path(__file__).read_bytes()).digest()[:7], "little")
+
+
+# Prefer the ahead-of-time build of the batch kernels (see build_aot.py) when present and current.
+# Otherwise the JIT kernels above are used; cache=True keeps them on disk between runs
+# (under __pycache__/ or NUMBA_CACHE_DIR).
+try:
+    import sim_kernel
+except ImportError:
+    sim_kernel = None
+if sim_kernel is not None and sim_kernel.source_hash() != _source_hash():
+    sim_kernel = None
+
+
+class Cache:
+    """Structure-of-arrays line store indexed [set, way]; the per-access work runs in `_access`."""
+
+    # Records per `_access_batch` call; bounds the suspect-event buffer
+    BATCH = 1 << 16
+
+    def __init__(self, cfg: Config):
+        self.cfg = cfg
+        shape = (cfg.sets, cfg.assoc)
+        self.tags = np.full(shape, -1, np.int64)
+        self.states = np.full(shape, INVALID, np.int8)
+        self.owners = np.full(shape, -1, np.int16)  # core id for E/M
+        self.sharers = np.zeros(shape, np.uint64)
+        self.last_writer = np.full(shape, -1, np.int16)
+        self.last_word = np.zeros(shape, np.int16)
+        self.fs_conf = np.zeros(shape, np.int8)
+        self.fs_suspect = np.zeros(shape, np.bool_)
+        self.lru_ts = np.zeros(shape, np.int64)  # last-touch time per way
+        self.clock = np.zeros(1, np.int64)
+        self.events = np.zeros((self.BATCH, 8), np.int64)  # one suspect-log row per event
+        # Per-access constants, bound once as plain ints instead of cfg lookups per access
+        self.assoc = cfg.assoc
+        self.fs_threshold = cfg.fs_threshold
+        # Fix-up mode as a 0/1 int for the suppress mask; fix on/off is chosen by the batch kernel below
+        self.fix_conservative = int(cfg.fix_mode == "conservative")
+        if sim_kernel is not None:
+            self._run_batch = sim_kernel.access_batch_fix if cfg.false_sharing_fix else sim_kernel.access_batch_nofix
         else:
-            line.fs_conf = max(line.fs_conf - 1, 0)
+            self._run_batch = _access_batch_fix if cfg.false_sharing_fix else _access_batch_nofix
 
-    def _should_suppress(self, line: CacheLine, word_idx: int, is_write: bool) -> bool:
-        cfg = self.cfg
-        if not cfg.false_sharing_fix:
-            return False
-        if not line.fs_suspect:
-            return False
-        if line.last_word == word_idx:
-            return False
-        if cfg.fix_mode == "conservative" and is_write:
-            return False
-        return True
+    def run(self, cores, is_writes, set_idx, line_tags, word_idx, stats: np.ndarray, logger):
+        """Simulate decoded trace arrays in batches, handing each batch's suspect events to `logger`."""
+        # Fixed dtypes: matches the AOT signatures and avoids extra JIT specializations
+        cores = np.ascontiguousarray(cores, np.int32)
+        is_writes = np.ascontiguousarray(is_writes, np.bool_)
+        set_idx = np.ascontiguousarray(set_idx, np.int64)
+        line_tags = np.ascontiguousarray(line_tags, np.int64)
+        word_idx = np.ascontiguousarray(word_idx, np.int64)
+        for start in range(0, cores.size, self.BATCH):
+            end = start + self.BATCH
+            n_events = self._run_batch(
+                self.tags, self.states, self.owners, self.sharers, self.last_writer, self.last_word,
+                self.fs_conf, self.fs_suspect, self.lru_ts, self.clock, stats, self.events,
+                cores[start:end], is_writes[start:end], set_idx[start:end], line_tags[start:end], word_idx[start:end],
+                self.assoc, self.fs_threshold, self.fix_conservative,
+            )
+            logger.log_suspects(self.events[:n_events])
 
 
 class Logger:
+    # Suspect rows are buffered and written in bulk rather than one writerow() per event
+    FLUSH_ROWS = 65536
+
     def __init__(self, path: Optional[str]):
         self.path = path
         self.file = open(path, "w", newline="") if path else None
@@ -169,78 +343,313 @@ class Logger:
         if self.writer:
             self.writer.writerow(["event_id", "addr", "core", "word_idx", "prev_core", "prev_word", "fs_conf", "fs_suspect"])
         self.event_id = 0
+        self._buf = []
+
+    @staticmethod
+    def _rows(events: np.ndarray) -> list:
+        rows = events.tolist()
+        if (events[:, 1] < 0).any():
+            # Tags are int64 views of uint64 line addresses; log them unsigned
+            for row, tag in zip(rows, events[:, 1].view(np.uint64).tolist()):
+                row[1] = tag
+        return rows
 
-    def log_suspect(self, core: int, line: CacheLine, word_idx: int):
+    def log_suspects(self, events: np.ndarray):
+        """`events` are full CSV rows as filled by `_record_suspect`; their id slots are stamped here."""
         if not self.writer:
             return
-        self.event_id += 1
-        self.writer.writerow(
-            [
-                self.event_id,
-                line.tag,
-                core,
-                word_idx,
-                line.last_writer_core,
-                line.last_word,
-                line.fs_conf,
-                int(line.fs_suspect),
-            ]
-        )
+        # Ids are stamped into the kernel's reusable event buffer, so each row costs only its list
+        events[:, 0] = np.arange(self.event_id + 1, self.event_id + 1 + len(events))
+        self._buf.extend(self._rows(events))
+        self.event_id += len(events)
+        if len(self._buf) >= self.FLUSH_ROWS:
+            self.flush()
+
+    def flush(self):
+        if self._buf:
+            self.writer.writerows(self._buf)
+            self._buf.clear()
 
     def close(self):
         if self.file:
+            self.flush()
             self.file.close()
 
 
-def run_trace(trace_path: str, cfg: Config, log_path: Optional[str]) -> Dict[str, int]:
+TRACE_COLUMNS = ["core", "op", "addr"]
+# Traces are parsed in blocks of this many bytes (Arrow) or records (pandas), so parser
+# temporaries stay bounded however large the trace is
+TRACE_BLOCK_BYTES = 1 << 20
+TRACE_CHUNK_ROWS = 1 << 18
+# Shortest possible record line, "0 R 0\n"
+MIN_RECORD_BYTES = 6
+
+# ASCII byte -> digit value (255 = not a hex/decimal digit), for vectorized address decode
+_DIGITS = np.full(256, 255, np.uint8)
+_DIGITS[np.frombuffer(b"0123456789", np.uint8)] = np.arange(10)
+_DIGITS[np.frombuffer(b"abcdef", np.uint8)] = np.arange(10, 16)
+_DIGITS[np.frombuffer(b"ABCDEF", np.uint8)] = np.arange(10, 16)
+
+
+def _parse_addr(text: str) -> int:
+    """int(text, 0) reduced to 64 address bits; negative values wrap as two's complement."""
+    value = int(text, 0)
+    if not -(1 << 63) <= value < (1 << 64):
+        raise ValueError(f"address {text!r} does not fit in 64 bits")
+    return value & 0xFFFF_FFFF_FFFF_FFFF
+
+
+def _skip_comment_rows(row) -> str:
+    # Comment lines tokenize to an arbitrary number of fields; any other malformed row is an error
+    return "skip" if row.text.lstrip().startswith("#") else "error"
+
+
+def _decode_addrs(col: pa.Array) -> np.ndarray:
+    """Vectorized int(s, 0) for plain 0x-hex and decimal strings; any other spelling goes through int()."""
+    addrs = np.zeros(len(col), np.uint64)
+    is_hex = pc.or_(pc.starts_with(col, "0x"), pc.starts_with(col, "0X")).to_numpy(zero_copy_only=False)
+    slow = []
+    # Widths keep every value below 2**64 so the digit accumulation cannot overflow
+    for rows, base, skip, width in ((np.flatnonzero(is_hex), 16, 2, 16), (np.flatnonzero(~is_hex), 10, 0, 19)):
+        if not rows.size:
+            continue
+        digits = pc.utf8_slice_codeunits(col.take(rows), skip)
+        lens = pc.utf8_length(digits).to_numpy(zero_copy_only=False)
+        ok = (lens > 0) & (lens <= width)
+        if base == 10:
+            # int("010", 0) is an error, so leave leading-zero decimals to int()
+            ok &= ~((lens > 1) & pc.starts_with(digits, "0").to_numpy(zero_copy_only=False))
+        fixed = pc.cast(pc.utf8_lpad(digits.filter(ok), width, "0"), pa.binary(width))
+        chars = np.frombuffer(fixed.buffers()[1], np.uint8, len(fixed) * width, fixed.offset * width)
+        vals = _DIGITS[chars].reshape(-1, width)
+        good = (vals != 255).all(axis=1)
+        # Horner's rule one digit column at a time; rows with a bad digit are discarded below
+        acc = np.zeros(len(vals), np.uint64)
+        for j in range(width):
+            acc *= np.uint64(base)
+            acc += vals[:, j]
+        fast_rows = rows[ok]
+        addrs[fast_rows[good]] = acc[good]
+        slow.append(rows[~ok])
+        slow.append(fast_rows[~good])
+    slow = np.concatenate(slow) if slow else np.empty(0, np.int64)
+    if slow.size:
+        addrs[slow] = [_parse_addr(a) for a in col.take(slow).to_pylist()]
+    return addrs
+
+
+def _alloc_trace(trace_path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Output arrays for the most records `trace_path` could hold; np.empty commits only the pages written."""
+    n = os.path.getsize(trace_path) // MIN_RECORD_BYTES + 1
+    return np.empty(n, np.int32), np.empty(n, bool), np.empty(n, np.uint64)
+
+
+def _trim_trace(arrays: Tuple[np.ndarray, np.ndarray, np.ndarray], n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Shrink `_alloc_trace` arrays in place to the `n` records parsed."""
+    for a in arrays:
+        a.resize(n, refcheck=False)
+    return arrays
+
+
+def _sniff_delimiter(trace_path: str) -> str:
+    """Tab if the first record line is tab separated, else a single space."""
+    with open(trace_path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith(b"#"):
+                return "\t" if b"\t" in line and b" " not in line else " "
+    return " "
+
+
+def _load_trace_whitespace(trace_path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Fallback parser for traces with irregular whitespace, trailing comments or extra fields."""
+    # Imported here so regular traces (and every pool worker) skip the pandas import cost
+    import pandas as pd
+
+    out = _alloc_trace(trace_path)
+    cores, is_write, addrs = out
+    n = 0
+    try:
+        with pd.read_csv(
+            trace_path,
+            sep=r"\s+",
+            comment="#",
+            header=None,
+            names=TRACE_COLUMNS,
+            usecols=[0, 1, 2],  # like the original line parser, ignore any extra fields
+            dtype={"core": np.int32, "op": "string", "addr": "string"},
+            chunksize=TRACE_CHUNK_ROWS,
+        ) as chunks:
+            for df in chunks:
+                missing = (df.op.isna() | df.addr.isna()).to_numpy()
+                if missing.any():
+                    raise ValueError(f"expected 'core R/W addr' on every line; record {n + int(missing.argmax()) + 1} has missing fields")
+                end = n + len(df)
+                cores[n:end] = df.core.to_numpy()
+                is_write[n:end] = df.op.str.upper().str.startswith("W").to_numpy(dtype=bool)
+                # Addresses may be hex or decimal; decoded like int(..., 0)
+                addrs[n:end] = _decode_addrs(pa.array(df.addr, pa.string()))
+                n = end
+    except pd.errors.EmptyDataError:
+        pass
+    return _trim_trace(out, n)
+
+
+def _load_trace_arrow(trace_path: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Stream a single-delimiter trace through Arrow's CSV reader; None if the trace needs the whitespace parser."""
+    out = _alloc_trace(trace_path)
+    cores, is_write, addrs = out
+    n = 0
+    delimiter = _sniff_delimiter(trace_path)
+    other = " " if delimiter == "\t" else "\t"
+    try:
+        reader = pa_csv.open_csv(
+            trace_path,
+            read_options=pa_csv.ReadOptions(column_names=TRACE_COLUMNS, block_size=TRACE_BLOCK_BYTES),
+            parse_options=pa_csv.ParseOptions(delimiter=delimiter, quote_char=False, invalid_row_handler=_skip_comment_rows),
+            convert_options=pa_csv.ConvertOptions(column_types={c: pa.string() for c in TRACE_COLUMNS}),
+        )
+        for batch in reader:
+            # Comments that happen to split into exactly three fields parse as rows; drop them here
+            batch = batch.filter(pc.invert(pc.starts_with(batch["core"], "#")))
+            # Doubled delimiters split into empty fields (e.g. '1  0x44' -> op ""), and mixed tabs and
+            # spaces leave the other one inside a field; both need the whitespace parser. Bad core
+            # fields already fail the int cast below.
+            for c in ("op", "addr"):
+                if pc.min(pc.binary_length(batch[c])).as_py() == 0 or pc.any(pc.match_substring(batch[c], other)).as_py():
+                    return None
+            end = n + batch.num_rows
+            cores[n:end] = pc.cast(batch["core"], pa.int32()).to_numpy()
+            is_write[n:end] = pc.starts_with(pc.utf8_upper(batch["op"]), "W").to_numpy(zero_copy_only=False)
+            addrs[n:end] = _decode_addrs(batch["addr"])
+            n = end
+    except pa.ArrowInvalid:
+        # Empty file, rows that are not single-delimiter separated, or core ids Arrow does not
+        # parse (e.g. '+1' or a header line); the whitespace parser accepts or reports them
+        return None
+    return _trim_trace(out, n)
+
+
+def load_trace(trace_path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parse a trace into (core, is_write, addr) arrays, streaming it through Arrow's CSV reader."""
+    try:
+        arrays = _load_trace_arrow(trace_path)
+        return arrays if arrays is not None else _load_trace_whitespace(trace_path)
+    except ValueError as e:
+        raise ValueError(f"{trace_path}: {e}") from e
+
+
+def stats_dict(stats: np.ndarray, cfg: Config) -> Dict[str, int]:
+    """Map the fixed-slot stats vector back to the named counters of the JSON summary."""
+    out = {name: int(stats[i]) for i, name in enumerate(STAT_NAMES)}
+    if not cfg.false_sharing_fix:
+        # Only reported when fix-up is enabled
+        del out["avoided_invalidations"]
+    return out
+
+
+def finalize_stats(results: List[np.ndarray], cfg: Config) -> List[Dict[str, float]]:
+    """Build JSON summaries for raw `run_trace` vectors, computing derived stats for the whole batch at once."""
+    if not results:
+        return []
+    table = np.stack(results)
+    instr = np.maximum(table[:, S_INSTR], 1)
+    ipki = table[:, S_INV] * 1000.0 / instr
+    cycles = table[:, S_STALL]
+    ipc = np.divide(instr, cycles, out=np.zeros(len(table)), where=cycles > 0)
+    out = []
+    for row, row_ipki, row_ipc in zip(table, ipki.tolist(), ipc.tolist()):
+        summary = stats_dict(row, cfg)
+        summary["ipki"] = row_ipki
+        summary["ipc_proxy"] = row_ipc
+        out.append(summary)
+    return out
+
+
+def run_trace(trace_path: str, cfg: Config, log_path: Optional[str]) -> np.ndarray:
+    """Simulate one trace and return its raw stats vector (see `finalize_stats` for the JSON summary)."""
     cache = Cache(cfg)
-    stats = defaultdict(int)
-    stats["instructions"] = 0
+    stats = np.zeros(N_STATS, np.int64)
+    cores, is_writes, addrs = load_trace(trace_path)
+    if cores.size and (cores.min() < 0 or cores.max() >= MAX_CORES):
+        raise ValueError(f"core ids must be in [0, {MAX_CORES})")
+    set_idx, line_tags, word_idx = decode_addresses(addrs, cfg)
     logger = Logger(log_path)
-    with open(trace_path) as f:
-        for line in f:
-            if not line.strip() or line.startswith("#"):
-                continue
-            parts = line.strip().split()
-            core = int(parts[0])
-            op = parts[1].upper()
-            addr = int(parts[2], 0)
-            is_write = op.startswith("W")
-            cache.access(core, is_write, addr, stats, logger)
-            stats["instructions"] += 1
-            stats["stall_cycles"] += cfg.hit_latency
+    cache.run(cores, is_writes, set_idx, line_tags, word_idx, stats, logger)
     logger.close()
-    # Derived stats
-    inv = stats["invalidations"]
-    instr = max(stats["instructions"], 1)
-    stats["ipki"] = inv * 1000.0 / instr
-    total_cycles = stats["stall_cycles"]
-    stats["ipc_proxy"] = instr / total_cycles if total_cycles else 0.0
+    # Every latency is constant per event class, so stall cycles are folded once from the counts
+    stats[S_INSTR] = cores.size
+    stats[S_STALL] = (
+        cfg.hit_latency * stats[S_INSTR] + cfg.miss_latency * stats[S_MISSES] + cfg.inv_latency * stats[S_INV_EVENTS]
+    )
     return stats
 
 
+def _output_path(template: Optional[str], trace_path: str) -> Optional[str]:
+    return template.replace("{trace}", Path(trace_path).stem) if template else None
+
+
+def _run_one(job: Tuple[str, Config, Optional[str]]) -> Tuple[str, np.ndarray]:
+    """Simulate one (trace, cfg, log) job; module-level so spawned pool workers can unpickle it."""
+    trace_path, cfg, log_path = job
+    return trace_path, run_trace(trace_path, cfg, log_path)
+
+
 def main():
     ap = argparse.ArgumentParser(description="False-sharing aware coherence simulator (trace-driven)")
-    ap.add_argument("trace", help="Trace file: lines of 'core R/W addr'")
+    ap.add_argument("traces", nargs="+", metavar="trace", help="Trace file(s): lines of 'core R/W addr'")
     ap.add_argument("--false-sharing-fix", action="store_true", help="Enable fix-up suppression for suspect lines")
     ap.add_argument("--fs-threshold", type=int, default=2, help="Confidence threshold to mark suspect")
     ap.add_argument("--word-bytes", type=int, default=4, help="Word granularity in bytes")
     ap.add_argument("--fix-mode", choices=["optimistic", "conservative"], default="optimistic", help="Fix-up mode when enabled")
-    ap.add_argument("--log", type=str, default=None, help="Path to suspect CSV log")
-    ap.add_argument("--json", type=str, default=None, help="Path to write summary stats JSON")
+    ap.add_argument("--log", type=str, default=None, help="Path to suspect CSV log ('{trace}' expands to the trace name)")
+    ap.add_argument("--json", type=str, default=None, help="Path to write summary stats JSON ('{trace}' expands to the trace name)")
+    ap.add_argument("--jobs", type=int, default=None, help="Worker processes when several traces are given (default: CPU count)")
     args = ap.parse_args()
 
-    cfg = Config(
-        word_bytes=args.word_bytes,
-        fs_threshold=args.fs_threshold,
-        false_sharing_fix=args.false_sharing_fix,
-        fix_mode=args.fix_mode,
-    )
-    stats = run_trace(args.trace, cfg, args.log)
-    print(json.dumps(stats, indent=2))
-    if args.json:
-        with open(args.json, "w") as f:
-            json.dump(stats, f, indent=2)
+    if args.jobs is not None and args.jobs < 1:
+        ap.error("--jobs must be at least 1")
+    if len(args.traces) > 1:
+        for opt, value in (("--log", args.log), ("--json", args.json)):
+            if value and "{trace}" not in value:
+                ap.error(f"{opt} needs a '{{trace}}' placeholder when several traces are given")
+        stems = [Path(t).stem for t in args.traces]
+        if (args.log or args.json) and len(set(stems)) != len(stems):
+            ap.error("trace file names must be unique when expanding '{trace}'")
+
+    try:
+        cfg = Config(
+            word_bytes=args.word_bytes,
+            fs_threshold=args.fs_threshold,
+            false_sharing_fix=args.false_sharing_fix,
+            fix_mode=args.fix_mode,
+        )
+    except ValueError as e:
+        ap.error(str(e))
+
+    jobs = [(t, cfg, _output_path(args.log, t)) for t in args.traces]
+    workers = min(args.jobs or os.cpu_count() or 1, len(jobs))
+    raw = {}
+    with contextlib.ExitStack() as stack:
+        if workers > 1:
+            # Traces are independent, so run them in parallel; compiled kernels come from the Numba cache
+            pool = stack.enter_context(mp.get_context("spawn").Pool(workers))
+            finished = pool.imap_unordered(_run_one, jobs)
+        else:
+            finished = map(_run_one, jobs)
+        for trace_path, stats in finished:
+            raw[trace_path] = stats
+
+    results = dict(zip(args.traces, finalize_stats([raw[t] for t in args.traces], cfg)))
+    for trace_path, stats in results.items():
+        json_path = _output_path(args.json, trace_path)
+        if json_path:
+            with open(json_path, "w") as f:
+                json.dump(stats, f, indent=2)
+    if len(args.traces) == 1:
+        print(json.dumps(results[args.traces[0]], indent=2))
+    else:
+        print(json.dumps(results, indent=2))
 
 
 if __name__ == "__main__":